@@ -0,0 +1,145 @@
+"""Compare request latency of a shared session and MimosaApi's own session.
+
+Starts a local stub of the Mimosa stats endpoint and times sequential
+requests, idle and while other clients keep the shared session busy. The
+owned path is ``MimosaApi.fetch_stats`` itself, with its session tuning,
+retries, circuit breaker, decoding and profiler hooks. Needs Home Assistant
+installed; run from the repository root: ``python benchmarks/latency.py``.
+"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from aiohttp import ClientSession, web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.mimosa.api import MimosaApi  # noqa: E402
+
+REQUESTS = 2000
+BACKGROUND_CLIENTS = 150
+BACKGROUND_DELAY = 0.05
+HOST = "127.0.0.1"
+PORT = 8765
+BASE_URL = f"http://{HOST}:{PORT}/"
+TOKEN = "benchmark-token"
+
+STATS = {
+    "offenses": {"total": 123456, "last_24h": 321, "last_7d": 2345, "last_1h": 12},
+    "blocks": {"current": 42, "total": 9876, "last_24h": 87, "last_7d": 654, "last_1h": 3},
+}
+
+
+async def _stats(_request: web.Request) -> web.Response:
+    return web.json_response(STATS)
+
+
+async def _slow(_request: web.Request) -> web.Response:
+    await asyncio.sleep(BACKGROUND_DELAY)
+    return web.json_response({})
+
+
+async def _start_stub() -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get("/api/homeassistant/stats", _stats)
+    app.router.add_get("/other", _slow)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+    return runner
+
+
+class _StubHass:
+    """Stands in for HomeAssistant; MimosaApi only keeps a reference to it."""
+
+
+def _shared_session() -> ClientSession:
+    # Home Assistant's global session uses the default connector.
+    return ClientSession()
+
+
+def _shared_request(session: ClientSession) -> Callable[[], Awaitable[None]]:
+    """Request path before MimosaApi owned its session (the old _request)."""
+
+    async def request() -> None:
+        url = f"{BASE_URL.rstrip('/')}/api/homeassistant/stats"
+        headers = {
+            "Authorization": f"Bearer {TOKEN}",
+            "Content-Type": "application/json",
+        }
+        async with asyncio.timeout(10):
+            async with session.request("GET", url, headers=headers) as resp:
+                await resp.json()
+
+    return request
+
+
+def _owned_api() -> MimosaApi:
+    return MimosaApi(hass=_StubHass(), base_url=BASE_URL, api_token=TOKEN)
+
+
+def _owned_request(api: MimosaApi) -> Callable[[], Awaitable[None]]:
+    """Request path of the integration: MimosaApi.fetch_stats."""
+
+    async def request() -> None:
+        await api.fetch_stats()
+
+    return request
+
+
+async def _background(session: ClientSession, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        async with session.get(f"{BASE_URL}other") as resp:
+            await resp.read()
+
+
+async def _measure(request: Callable[[], Awaitable[None]]) -> List[float]:
+    for _ in range(50):
+        await request()
+    samples: List[float] = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        await request()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _report(name: str, samples: List[float]) -> None:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered) * 1000
+    p99 = ordered[len(ordered) * 99 // 100] * 1000
+    print(f"{name:<28}{p50:>10.3f} ms{p99:>10.3f} ms")
+
+
+async def main() -> None:
+    runner = await _start_stub()
+    print(f"{'request path':<28}{'p50':>13}{'p99':>13}")
+    try:
+        for loaded in (False, True):
+            suffix = ", busy" if loaded else ", idle"
+            shared = _shared_session()
+            owned = _owned_api()
+            stop = asyncio.Event()
+            background = [
+                asyncio.create_task(_background(shared, stop))
+                for _ in range(BACKGROUND_CLIENTS if loaded else 0)
+            ]
+            try:
+                _report(f"shared session{suffix}", await _measure(_shared_request(shared)))
+                _report(f"owned session{suffix}", await _measure(_owned_request(owned)))
+            finally:
+                stop.set()
+                await asyncio.gather(*background)
+                await shared.close()
+                await owned.async_close()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Compare memory held by raw decoded payloads and the compact models.
+
+Run from the repository root: ``python benchmarks/memory.py``.
+"""
+from __future__ import annotations
+
+import gc
+import importlib.util
+import json
+from pathlib import Path
+import random
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+RULES = 10_000
+POINTS = 50_000
+
+_MODELS_PATH = (
+    Path(__file__).resolve().parent.parent / "custom_components" / "mimosa" / "models.py"
+)
+_spec = importlib.util.spec_from_file_location("mimosa_models", _MODELS_PATH)
+models = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(models)
+
+
+def _rules_payload() -> bytes:
+    rules = [
+        {
+            "uuid": f"{index:08x}-5a1e-4c2b-9d3f-{index:012x}",
+            "type": random.choice(("whitelist", "blacklist", "temporal", "custom")),
+            "name": f"Rule {index}",
+            "description": f"Generated rule number {index}",
+            "enabled": bool(index % 2),
+            "action": "block",
+            "interface": "wan",
+            "source": f"10.{index % 256}.{index // 256 % 256}.0/24",
+            "destination": "any",
+            "created_at": "2024-01-01T00:00:00Z",
+        }
+        for index in range(RULES)
+    ]
+    return json.dumps({"rules": rules}).encode()
+
+
+def _heatmap_payload() -> bytes:
+    points = [
+        {
+            "lat": random.uniform(-90, 90),
+            "lon": random.uniform(-180, 180),
+            "count": random.randint(1, 500),
+        }
+        for _ in range(POINTS)
+    ]
+    return json.dumps(
+        {"window": "24h", "points": points, "points_count": POINTS, "total_profiles": POINTS}
+    ).encode()
+
+
+def _rules_model(raw: bytes) -> Any:
+    return {
+        rule["uuid"]: models.MimosaFirewallRule.from_payload(rule["uuid"], rule)
+        for rule in json.loads(raw)["rules"]
+    }
+
+
+def _measure(build: Callable[[], Any]) -> Tuple[int, Any]:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, value
+
+
+def main() -> None:
+    random.seed(0)
+    cases = (
+        (f"firewall rules ({RULES})", _rules_payload(), _rules_model),
+        (
+            f"heatmap points ({POINTS})",
+            _heatmap_payload(),
+            lambda raw: models.MimosaHeatmap.from_payload(json.loads(raw)),
+        ),
+    )
+    print(f"{'payload':<24}{'raw dict':>14}{'model':>14}{'ratio':>8}")
+    for name, raw, build_model in cases:
+        raw_size, _raw = _measure(lambda: json.loads(raw))
+        model_size, _model = _measure(lambda: build_model(raw))
+        print(
+            f"{name:<24}{raw_size / 1024 / 1024:>11.2f} MB"
+            f"{model_size / 1024 / 1024:>11.2f} MB{raw_size / model_size:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
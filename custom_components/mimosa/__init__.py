@@ -2,38 +2,65 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+import logging
+from typing import Any, Dict, Optional
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .api import MimosaApi
+from .api import MimosaApi, MimosaApiError
+from .batcher import MimosaEntityUpdateBatcher
 from .const import (
     CONF_API_TOKEN,
     CONF_BASE_URL,
     CONF_CLIENT_ID,
+    CONF_CONNECT_TIMEOUT,
+    CONF_NAME,
     CONF_HEATMAP_INTERVAL,
     CONF_HEATMAP_LIMIT,
     CONF_HEATMAP_SOURCE,
     CONF_HEATMAP_WINDOW,
+    CONF_HISTORY_MAX_AGE,
+    CONF_HISTORY_MAX_EVENTS,
+    CONF_READ_TIMEOUT,
     CONF_RULES_INTERVAL,
+    CONF_SERVER_INFO,
     CONF_SIGNALS_INTERVAL,
     CONF_STATS_INTERVAL,
+    CONF_TRAFFIC_RECORD_FILE,
+    CONF_TRAFFIC_REPLAY_FILE,
+    CONF_TRAFFIC_REPLAY_SPEED,
     CONF_ENABLE_HEATMAP,
     CONF_ENABLE_SIGNALS,
     CONF_ENABLE_FIREWALL_RULES,
+    CONF_FIREWALL_CONFIG_IDS,
+    DEFAULT_CONNECT_TIMEOUT,
     DEFAULT_HEATMAP_INTERVAL,
     DEFAULT_HEATMAP_LIMIT,
     DEFAULT_HEATMAP_SOURCE,
     DEFAULT_HEATMAP_WINDOW,
+    DEFAULT_HISTORY_MAX_AGE,
+    DEFAULT_HISTORY_MAX_EVENTS,
+    DEFAULT_NAME,
+    DEFAULT_READ_TIMEOUT,
     DEFAULT_ENABLE_FIREWALL_RULES,
+    DEFAULT_FIREWALL_CONFIG_IDS,
     DEFAULT_ENABLE_HEATMAP,
     DEFAULT_ENABLE_SIGNALS,
     DEFAULT_RULES_INTERVAL,
     DEFAULT_SIGNALS_INTERVAL,
     DEFAULT_STATS_INTERVAL,
+    DEFAULT_TRAFFIC_RECORD_FILE,
+    DEFAULT_TRAFFIC_REPLAY_FILE,
+    DEFAULT_TRAFFIC_REPLAY_SPEED,
     DOMAIN,
+    FEATURE_FIREWALL_RULES,
+    FEATURE_HEATMAP,
+    FEATURE_SIGNALS,
 )
 from .coordinator import (
     MimosaFirewallRulesCoordinator,
@@ -41,25 +68,67 @@ from .coordinator import (
     MimosaSignalsCoordinator,
     MimosaStatsCoordinator,
 )
+from .services import async_setup_services
+from .statistics import MimosaStatisticsImporter, async_remove_statistics_store
+from .traffic import MimosaReplayTransport, MimosaTrafficRecorder
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 
 @dataclass
 class MimosaRuntime:
     api: MimosaApi
+    batcher: MimosaEntityUpdateBatcher
     stats_coordinator: MimosaStatsCoordinator
     signals_coordinator: Optional[MimosaSignalsCoordinator]
     heatmap_coordinator: Optional[MimosaHeatmapCoordinator]
     firewall_rules_coordinator: Optional[MimosaFirewallRulesCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     base_url = entry.data[CONF_BASE_URL]
     api_token = entry.data[CONF_API_TOKEN]
-    api = MimosaApi(hass=hass, base_url=base_url, api_token=api_token)
-
     options = entry.options
+    api = MimosaApi(
+        hass=hass,
+        base_url=base_url,
+        api_token=api_token,
+        connect_timeout=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    )
+    entry.async_on_unload(api.async_close)
+
+    replay_file = options.get(CONF_TRAFFIC_REPLAY_FILE, DEFAULT_TRAFFIC_REPLAY_FILE)
+    if replay_file:
+        replay_path = hass.config.path(replay_file)
+        try:
+            api.replay = await MimosaReplayTransport.async_load(
+                hass,
+                replay_path,
+                options.get(CONF_TRAFFIC_REPLAY_SPEED, DEFAULT_TRAFFIC_REPLAY_SPEED),
+            )
+        except (OSError, EOFError, ValueError, KeyError, TypeError) as err:
+            # Missing or corrupt recordings, or a non-positive speed saved
+            # before the options flow validated it.
+            raise ConfigEntryError(
+                f"Cannot replay Mimosa traffic from {replay_path}: {err}"
+            ) from err
+    record_file = options.get(CONF_TRAFFIC_RECORD_FILE, DEFAULT_TRAFFIC_RECORD_FILE)
+    if record_file:
+        api.recorder = MimosaTrafficRecorder(hass, hass.config.path(record_file))
+        entry.async_on_unload(api.recorder.async_close)
+
+    server_info = await _async_refresh_server_info(hass, entry, api)
+
     stats_interval = options.get(CONF_STATS_INTERVAL, DEFAULT_STATS_INTERVAL)
     signals_interval = options.get(CONF_SIGNALS_INTERVAL, DEFAULT_SIGNALS_INTERVAL)
     heatmap_interval = options.get(CONF_HEATMAP_INTERVAL, DEFAULT_HEATMAP_INTERVAL)
@@ -68,20 +137,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     heatmap_source = options.get(CONF_HEATMAP_SOURCE, DEFAULT_HEATMAP_SOURCE)
     heatmap_limit = options.get(CONF_HEATMAP_LIMIT, DEFAULT_HEATMAP_LIMIT)
 
-    enable_signals = options.get(CONF_ENABLE_SIGNALS, DEFAULT_ENABLE_SIGNALS)
-    enable_heatmap = options.get(CONF_ENABLE_HEATMAP, DEFAULT_ENABLE_HEATMAP)
+    enable_signals = options.get(
+        CONF_ENABLE_SIGNALS, DEFAULT_ENABLE_SIGNALS
+    ) and _feature_supported(server_info, FEATURE_SIGNALS)
+    enable_heatmap = options.get(
+        CONF_ENABLE_HEATMAP, DEFAULT_ENABLE_HEATMAP
+    ) and _feature_supported(server_info, FEATURE_HEATMAP)
     enable_firewall_rules = options.get(
         CONF_ENABLE_FIREWALL_RULES, DEFAULT_ENABLE_FIREWALL_RULES
-    )
+    ) and _feature_supported(server_info, FEATURE_FIREWALL_RULES)
 
     stats_coordinator = MimosaStatsCoordinator(hass, api, stats_interval)
+    if "recorder" in hass.config.components:
+        statistics = MimosaStatisticsImporter(
+            hass, api, entry.entry_id, entry.data.get(CONF_NAME, DEFAULT_NAME)
+        )
+        await statistics.async_load()
+        stats_coordinator.statistics = statistics
     await stats_coordinator.async_config_entry_first_refresh()
+    if stats_coordinator.statistics:
+        entry.async_create_background_task(
+            hass,
+            stats_coordinator.statistics.async_backfill(),
+            "mimosa_statistics_backfill",
+        )
 
     signals_coordinator = None
     if enable_signals:
         client_id = options.get(CONF_CLIENT_ID, entry.data.get(CONF_CLIENT_ID, "homeassistant"))
         signals_coordinator = MimosaSignalsCoordinator(
-            hass, api, signals_interval, client_id
+            hass,
+            api,
+            signals_interval,
+            client_id,
+            history_max_events=options.get(
+                CONF_HISTORY_MAX_EVENTS, DEFAULT_HISTORY_MAX_EVENTS
+            ),
+            history_max_age=options.get(CONF_HISTORY_MAX_AGE, DEFAULT_HISTORY_MAX_AGE),
         )
         await signals_coordinator.async_config_entry_first_refresh()
 
@@ -99,14 +191,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     firewall_rules_coordinator = None
     if enable_firewall_rules:
+        config_ids = [
+            config_id.strip()
+            for config_id in options.get(
+                CONF_FIREWALL_CONFIG_IDS, DEFAULT_FIREWALL_CONFIG_IDS
+            ).split(",")
+            if config_id.strip()
+        ]
         firewall_rules_coordinator = MimosaFirewallRulesCoordinator(
-            hass, api, rules_interval, config_id=None
+            hass, api, rules_interval, config_ids=config_ids or [None]
         )
         await firewall_rules_coordinator.async_config_entry_first_refresh()
 
+    batcher = MimosaEntityUpdateBatcher(hass)
+    entry.async_on_unload(batcher.async_shutdown)
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = MimosaRuntime(
         api=api,
+        batcher=batcher,
         stats_coordinator=stats_coordinator,
         signals_coordinator=signals_coordinator,
         heatmap_coordinator=heatmap_coordinator,
@@ -125,5 +228,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await async_remove_statistics_store(hass, entry.entry_id)
+
+
+async def _async_refresh_server_info(
+    hass: HomeAssistant, entry: ConfigEntry, api: MimosaApi
+) -> Dict[str, Any]:
+    """Refresh the cached handshake, falling back to the cached copy on errors."""
+    cached = entry.data.get(CONF_SERVER_INFO) or {}
+    try:
+        server_info = await api.fetch_info()
+    except MimosaApiError as err:
+        _LOGGER.debug("Mimosa handshake failed, using cached server info: %s", err)
+        return cached
+    if server_info != cached:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_SERVER_INFO: server_info}
+        )
+    return server_info
+
+
+def _feature_supported(server_info: Dict[str, Any], feature: str) -> bool:
+    """Return False only when the server reports the feature as disabled."""
+    return server_info.get("features", {}).get(feature, True)
+
+
 async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
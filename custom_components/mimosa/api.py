@@ -1,14 +1,41 @@
 """API client for Mimosa."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+import random
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
-import async_timeout
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.json import json_loads
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+)
+from .profiler import PROFILER, profiled
+
+if TYPE_CHECKING:
+    from .traffic import MimosaReplayTransport, MimosaTrafficRecorder
+
+CONNECTION_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 5.0
+
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 60
 
 
 class MimosaApiError(Exception):
@@ -27,6 +54,130 @@ class MimosaServiceUnavailable(MimosaApiError):
     """Raised when Mimosa reports service unavailable."""
 
 
+class MimosaNotFound(MimosaApiError):
+    """Raised when an endpoint does not exist on the Mimosa server."""
+
+
+class MimosaConnectionError(MimosaApiError):
+    """Raised when Mimosa cannot be reached or times out."""
+
+
+class MimosaServerError(MimosaApiError):
+    """Raised when Mimosa answers with a server error."""
+
+
+class MimosaCircuitOpen(MimosaServiceUnavailable):
+    """Raised when requests are short-circuited by the breaker."""
+
+
+# Errors that indicate an unhealthy server: retried for idempotent requests
+# and counted by the circuit breaker.
+TRANSIENT_ERRORS = (MimosaConnectionError, MimosaServerError, MimosaServiceUnavailable)
+
+
+class MimosaCircuitBreaker:
+    """Circuit breaker shared by every request to one Mimosa host."""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._listeners: list[Callable[[], None]] = []
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(listener)
+
+        return _remove
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    def _set_state(self, state: str) -> bool:
+        if state == self.state:
+            return False
+        self.state = state
+        return True
+
+    def before_request(self) -> None:
+        """Raise MimosaCircuitOpen unless a request may go through.
+
+        Once the reset timeout has elapsed the breaker half-opens and lets a
+        single probe through; other callers keep failing fast until it ends.
+        """
+        if self.state == BREAKER_CLOSED:
+            return
+        if self.state == BREAKER_OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise MimosaCircuitOpen("Circuit open")
+            if self._set_state(BREAKER_HALF_OPEN):
+                self._notify()
+        if self._probe_in_flight:
+            raise MimosaCircuitOpen("Circuit half-open, probe in flight")
+        self._probe_in_flight = True
+
+    def release_probe(self) -> None:
+        """Allow a new probe when one ended without an outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self._probe_in_flight = False
+        had_failures = self.failures > 0
+        self.failures = 0
+        if self._set_state(BREAKER_CLOSED) or had_failures:
+            self._notify()
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(BREAKER_OPEN)
+        # Listeners also track the failure count, so notify on every failure.
+        self._notify()
+
+
+def _decode(body: bytes) -> Any:
+    if not body:
+        return {}
+    try:
+        return json_loads(body)
+    except ValueError as err:
+        raise MimosaApiError(f"Invalid JSON response: {err}") from err
+
+
+def _handle_response(status: int, body: Any) -> Any:
+    if status == 0:
+        raise MimosaConnectionError(body)
+    if status == 401:
+        raise MimosaAuthError("Unauthorized")
+    if status == 403:
+        raise MimosaFeatureDisabled("Feature disabled")
+    if status == 503:
+        raise MimosaServiceUnavailable("Service unavailable")
+    if status == 404:
+        raise MimosaNotFound(f"HTTP {status}: {body}")
+    if status >= 500:
+        raise MimosaServerError(f"HTTP {status}: {body}")
+    if status >= 400:
+        raise MimosaApiError(f"HTTP {status}: {body}")
+    if status == 204:
+        return {}
+    return body
+
+
 @dataclass
 class MimosaApi:
     """Async client for Mimosa API."""
@@ -34,15 +185,64 @@ class MimosaApi:
     hass: HomeAssistant
     base_url: str
     api_token: str
-    timeout: int = 10
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    read_timeout: float = DEFAULT_READ_TIMEOUT
+    _session: Optional[ClientSession] = field(default=None, init=False, repr=False)
+    breaker: MimosaCircuitBreaker = field(
+        default_factory=MimosaCircuitBreaker, init=False, repr=False
+    )
+    recorder: Optional[MimosaTrafficRecorder] = field(
+        default=None, init=False, repr=False
+    )
+    replay: Optional[MimosaReplayTransport] = field(default=None, init=False, repr=False)
 
-    @property
-    def _headers(self) -> Dict[str, str]:
-        return {
+    def __post_init__(self) -> None:
+        self._base_url = self.base_url.rstrip("/")
+        self._headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json",
         }
+        # No total cap: the connect and read timeouts bound each request.
+        self._client_timeout = ClientTimeout(
+            total=None,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+        self._urls: Dict[str, str] = {}
+
+    def _url(self, path: str) -> str:
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = f"{self._base_url}{path}"
+        return url
+
+    def _get_session(self) -> ClientSession:
+        """Return the session owned by this client, creating it on first use.
+
+        A dedicated session keeps a warm keep-alive pool to the Mimosa host
+        instead of sharing connection limits with every other integration.
+        """
+        if self._session is None or self._session.closed:
+            connector = TCPConnector(
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=True,
+                ssl=get_default_context(),
+            )
+            self._session = ClientSession(
+                connector=connector,
+                headers=self._headers,
+                timeout=self._client_timeout,
+            )
+        return self._session
 
+    async def async_close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @profiled("api.request")
     async def _request(
         self,
         method: str,
@@ -50,31 +250,103 @@ class MimosaApi:
         *,
         params: Optional[Dict[str, Any]] = None,
     ) -> Any:
-        url = f"{self.base_url.rstrip('/')}{path}"
-        session = async_get_clientsession(self.hass)
+        self.breaker.before_request()
+        # Only GET requests are idempotent and safe to retry.
+        attempts = RETRY_ATTEMPTS if method == "GET" else 1
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await self._send(method, path, params)
+                except TRANSIENT_ERRORS:
+                    attempt += 1
+                    if attempt >= attempts:
+                        self.breaker.record_failure()
+                        raise
+                    delay = min(
+                        RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                    )
+                    await asyncio.sleep(random.uniform(0, delay))
+                except MimosaApiError:
+                    # The server answered, so it is reachable.
+                    self.breaker.record_success()
+                    raise
+                else:
+                    self.breaker.record_success()
+                    return result
+        except BaseException:
+            # Any exit without an outcome (e.g. cancelled during a request or
+            # the backoff sleep) must not leave a half-open probe in flight.
+            self.breaker.release_probe()
+            raise
+
+    async def _send(
+        self, method: str, path: str, params: Optional[Dict[str, Any]]
+    ) -> Any:
+        started = time.monotonic()
+        if self.replay is not None:
+            status, body = await self.replay.async_response(method, path, params)
+        else:
+            status, body = await self._send_http(method, path, params)
+        if self.recorder is not None:
+            self.recorder.record(
+                method, path, params, status, body, time.monotonic() - started
+            )
+        return _handle_response(status, body)
+
+    async def _send_http(
+        self, method: str, path: str, params: Optional[Dict[str, Any]]
+    ) -> Tuple[int, Any]:
+        """Return the status and body of a request; status 0 is a connection error."""
+        started = time.perf_counter()
+        session = self._get_session()
         try:
-            async with async_timeout.timeout(self.timeout):
-                async with session.request(
-                    method, url, headers=self._headers, params=params
-                ) as resp:
-                    if resp.status == 401:
-                        raise MimosaAuthError("Unauthorized")
-                    if resp.status == 403:
-                        raise MimosaFeatureDisabled("Feature disabled")
-                    if resp.status == 503:
-                        raise MimosaServiceUnavailable("Service unavailable")
-                    if resp.status >= 400:
-                        text = await resp.text()
-                        raise MimosaApiError(f"HTTP {resp.status}: {text}")
-                    if resp.status == 204:
-                        return {}
-                    return await resp.json()
+            async with session.request(method, self._url(path), params=params) as resp:
+                status = resp.status
+                if status in (204, 401, 403, 503):
+                    return status, None
+                if status >= 400:
+                    return status, await resp.text()
+                body = await resp.read()
+        except asyncio.TimeoutError:
+            return 0, "Timeout"
         except ClientError as err:
-            raise MimosaApiError(str(err)) from err
+            return 0, str(err)
+        if not PROFILER.active:
+            return status, _decode(body)
+        decode_started = time.perf_counter()
+        PROFILER.add("api.network", decode_started - started)
+        payload = _decode(body)
+        PROFILER.add("api.decode", time.perf_counter() - decode_started)
+        return status, payload
+
+    async def fetch_info(self) -> Dict[str, Any]:
+        """Return auth status, server version and enabled features in one call."""
+        payload = await self._request("GET", "/api/homeassistant/info")
+        if not isinstance(payload, dict):
+            raise MimosaApiError(f"Unexpected info response: {payload!r:.100}")
+        if payload.get("authenticated") is False:
+            raise MimosaAuthError("Unauthorized")
+        features = payload.get("features")
+        return {
+            "version": payload.get("version"),
+            "features": {
+                str(name): bool(enabled) for name, enabled in features.items()
+            }
+            if isinstance(features, dict)
+            else {},
+        }
 
     async def fetch_stats(self) -> Dict[str, Any]:
         return await self._request("GET", "/api/homeassistant/stats")
 
+    async def fetch_stats_history(self, *, start: datetime) -> Dict[str, Any]:
+        return await self._request(
+            "GET",
+            "/api/homeassistant/stats/history",
+            params={"start": start.isoformat(), "bucket": "1h"},
+        )
+
     async def fetch_signals(self, client_id: str) -> Dict[str, Any]:
         return await self._request(
             "GET", "/api/homeassistant/signals", params={"client_id": client_id}
@@ -0,0 +1,106 @@
+"""Coalesced entity state writes for Mimosa."""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+from .profiler import profiled
+
+BATCH_WINDOW = 0.5
+MIN_WRITE_INTERVAL = 5.0
+
+
+class MimosaEntityUpdateBatcher:
+    """Collapse state writes of the same entity into one per window.
+
+    Writes are delayed by a short window and each entity is written at most
+    once per ``min_interval``; later requests inside the interval are merged
+    into a single write when it elapses.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window: float = BATCH_WINDOW,
+        min_interval: float = MIN_WRITE_INTERVAL,
+    ) -> None:
+        self.hass = hass
+        self.window = window
+        self.min_interval = min_interval
+        self._pending: Dict[int, Entity] = {}
+        self._last_write: Dict[int, float] = {}
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_schedule(self, entity: Entity) -> None:
+        self._pending[id(entity)] = entity
+        if self._unsub is None:
+            self._unsub = async_call_later(self.hass, self.window, self._async_flush)
+
+    @callback
+    def async_expedite(self, entity: Entity) -> None:
+        """Let the next write of the entity skip the minimum interval."""
+        self._last_write.pop(id(entity), None)
+
+    @callback
+    def async_cancel(self, entity: Entity) -> None:
+        self._pending.pop(id(entity), None)
+        self._last_write.pop(id(entity), None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._pending.clear()
+
+    @callback
+    @profiled("batcher.flush")
+    def _async_flush(self, _now: Any) -> None:
+        self._unsub = None
+        now = time.monotonic()
+        next_due: Optional[float] = None
+        for key, entity in list(self._pending.items()):
+            due = self._last_write.get(key, 0.0) + self.min_interval
+            if due > now:
+                next_due = due if next_due is None else min(next_due, due)
+                continue
+            del self._pending[key]
+            self._last_write[key] = now
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+        if next_due is not None:
+            self._unsub = async_call_later(
+                self.hass, max(self.window, next_due - now), self._async_flush
+            )
+
+
+class MimosaBatchedEntityMixin:
+    """Route coordinator updates of an entity through the entry batcher.
+
+    Must be listed before CoordinatorEntity in the bases.
+    """
+
+    _batcher: Optional[MimosaEntityUpdateBatcher] = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        runtime = self.hass.data[DOMAIN][self.platform.config_entry.entry_id]
+        self._batcher = runtime.batcher
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._batcher is not None:
+            self._batcher.async_cancel(self)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._batcher is None:
+            super()._handle_coordinator_update()
+            return
+        self._batcher.async_schedule(self)
@@ -37,7 +37,10 @@ async def async_setup_entry(
 class MimosaSignalBinarySensor(
     CoordinatorEntity[MimosaSignalsCoordinator], BinarySensorEntity
 ):
-    """Binary sensor for Mimosa signals."""
+    """Binary sensor for Mimosa signals.
+
+    Problem sensors bypass the entry batcher so signals are written immediately.
+    """
 
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
@@ -60,17 +63,17 @@ class MimosaSignalBinarySensor(
 
     @property
     def is_on(self) -> bool | None:
-        data = self.coordinator.data or {}
-        signal = data.get(self._signal_key) or {}
-        return bool(signal.get("new")) if signal else False
+        data = self.coordinator.data
+        signal = data.signal(self._signal_key) if data is not None else None
+        return bool(signal.new) if signal is not None else False
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
-        data = self.coordinator.data or {}
-        signal = data.get(self._signal_key) or {}
+        data = self.coordinator.data
+        signal = data.signal(self._signal_key) if data is not None else None
         return {
-            "new_count": signal.get("new_count"),
-            "last_id": signal.get("last_id"),
-            "last": signal.get("last"),
-            "timestamp": data.get("timestamp"),
+            "new_count": signal.new_count if signal is not None else None,
+            "last_id": signal.last_id if signal is not None else None,
+            "last": signal.last if signal is not None else None,
+            "timestamp": data.timestamp if data is not None else None,
         }
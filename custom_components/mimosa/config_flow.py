@@ -1,6 +1,7 @@
 """Config flow for Mimosa integration."""
 from __future__ import annotations
 
+import os
 from typing import Any, Dict, Optional
 
 import voluptuous as vol
@@ -16,49 +17,70 @@ from .api import (
     MimosaApiError,
     MimosaAuthError,
     MimosaFeatureDisabled,
+    MimosaNotFound,
     MimosaServiceUnavailable,
 )
 from .const import (
     CONF_API_TOKEN,
     CONF_BASE_URL,
     CONF_CLIENT_ID,
+    CONF_CONNECT_TIMEOUT,
     CONF_ENABLE_FIREWALL_RULES,
     CONF_ENABLE_HEATMAP,
     CONF_ENABLE_SIGNALS,
+    CONF_FIREWALL_CONFIG_IDS,
     CONF_HEATMAP_INTERVAL,
     CONF_HEATMAP_LIMIT,
     CONF_HEATMAP_SOURCE,
     CONF_HEATMAP_WINDOW,
+    CONF_HISTORY_MAX_AGE,
+    CONF_HISTORY_MAX_EVENTS,
+    CONF_READ_TIMEOUT,
     CONF_RULES_INTERVAL,
+    CONF_SERVER_INFO,
     CONF_SIGNALS_INTERVAL,
     CONF_STATS_INTERVAL,
+    CONF_TRAFFIC_RECORD_FILE,
+    CONF_TRAFFIC_REPLAY_FILE,
+    CONF_TRAFFIC_REPLAY_SPEED,
+    DEFAULT_CONNECT_TIMEOUT,
     DEFAULT_HEATMAP_INTERVAL,
     DEFAULT_HEATMAP_LIMIT,
     DEFAULT_HEATMAP_SOURCE,
     DEFAULT_HEATMAP_WINDOW,
+    DEFAULT_HISTORY_MAX_AGE,
+    DEFAULT_HISTORY_MAX_EVENTS,
     DEFAULT_ENABLE_FIREWALL_RULES,
     DEFAULT_ENABLE_HEATMAP,
     DEFAULT_ENABLE_SIGNALS,
+    DEFAULT_FIREWALL_CONFIG_IDS,
     DEFAULT_NAME,
+    DEFAULT_READ_TIMEOUT,
     DEFAULT_RULES_INTERVAL,
     DEFAULT_SIGNALS_INTERVAL,
     DEFAULT_STATS_INTERVAL,
+    DEFAULT_TRAFFIC_RECORD_FILE,
+    DEFAULT_TRAFFIC_REPLAY_FILE,
+    DEFAULT_TRAFFIC_REPLAY_SPEED,
     DOMAIN,
 )
 
 
 async def _validate(
     hass: HomeAssistant, base_url: str, api_token: str
-) -> None:
+) -> Dict[str, Any]:
     api = MimosaApi(hass=hass, base_url=base_url, api_token=api_token)
     try:
-        await api.fetch_stats()
-    except MimosaAuthError as err:
-        raise err
-    except (MimosaFeatureDisabled, MimosaServiceUnavailable):
-        return
-    except MimosaApiError as err:
-        raise err
+        return await api.fetch_info()
+    except MimosaNotFound:
+        # Servers without the handshake endpoint: fall back to a stats fetch.
+        try:
+            await api.fetch_stats()
+        except (MimosaFeatureDisabled, MimosaServiceUnavailable):
+            pass
+        return {}
+    finally:
+        await api.async_close()
 
 
 class MimosaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -81,7 +103,7 @@ class MimosaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._abort_if_unique_id_configured()
 
             try:
-                await _validate(self.hass, base_url, api_token)
+                server_info = await _validate(self.hass, base_url, api_token)
             except MimosaAuthError:
                 errors["base"] = "invalid_auth"
             except MimosaApiError:
@@ -94,6 +116,7 @@ class MimosaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_BASE_URL: base_url,
                         CONF_API_TOKEN: api_token,
                         CONF_CLIENT_ID: client_id,
+                        CONF_SERVER_INFO: server_info,
                     },
                 )
 
@@ -122,10 +145,17 @@ class MimosaOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(
         self, user_input: Optional[Dict[str, Any]] = None
     ) -> FlowResult:
+        errors: Dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            replay_file = user_input.get(CONF_TRAFFIC_REPLAY_FILE)
+            if replay_file and not await self.hass.async_add_executor_job(
+                os.path.isfile, self.hass.config.path(replay_file)
+            ):
+                errors[CONF_TRAFFIC_REPLAY_FILE] = "replay_file_not_found"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
-        options = self.config_entry.options
+        options = {**self.config_entry.options, **(user_input or {})}
         data_schema = vol.Schema(
             {
                 vol.Optional(CONF_CLIENT_ID, default=options.get(CONF_CLIENT_ID, "homeassistant")): str,
@@ -136,10 +166,20 @@ class MimosaOptionsFlow(config_entries.OptionsFlow):
                 vol.Optional(CONF_ENABLE_SIGNALS, default=options.get(CONF_ENABLE_SIGNALS, DEFAULT_ENABLE_SIGNALS)): bool,
                 vol.Optional(CONF_ENABLE_HEATMAP, default=options.get(CONF_ENABLE_HEATMAP, DEFAULT_ENABLE_HEATMAP)): bool,
                 vol.Optional(CONF_ENABLE_FIREWALL_RULES, default=options.get(CONF_ENABLE_FIREWALL_RULES, DEFAULT_ENABLE_FIREWALL_RULES)): bool,
+                vol.Optional(CONF_FIREWALL_CONFIG_IDS, default=options.get(CONF_FIREWALL_CONFIG_IDS, DEFAULT_FIREWALL_CONFIG_IDS)): str,
                 vol.Optional(CONF_HEATMAP_SOURCE, default=options.get(CONF_HEATMAP_SOURCE, DEFAULT_HEATMAP_SOURCE)): str,
                 vol.Optional(CONF_HEATMAP_WINDOW, default=options.get(CONF_HEATMAP_WINDOW, DEFAULT_HEATMAP_WINDOW)): str,
                 vol.Optional(CONF_HEATMAP_LIMIT, default=options.get(CONF_HEATMAP_LIMIT, DEFAULT_HEATMAP_LIMIT)): int,
+                vol.Optional(CONF_HISTORY_MAX_EVENTS, default=options.get(CONF_HISTORY_MAX_EVENTS, DEFAULT_HISTORY_MAX_EVENTS)): int,
+                vol.Optional(CONF_HISTORY_MAX_AGE, default=options.get(CONF_HISTORY_MAX_AGE, DEFAULT_HISTORY_MAX_AGE)): int,
+                vol.Optional(CONF_CONNECT_TIMEOUT, default=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)): int,
+                vol.Optional(CONF_READ_TIMEOUT, default=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)): int,
+                vol.Optional(CONF_TRAFFIC_RECORD_FILE, default=options.get(CONF_TRAFFIC_RECORD_FILE, DEFAULT_TRAFFIC_RECORD_FILE)): str,
+                vol.Optional(CONF_TRAFFIC_REPLAY_FILE, default=options.get(CONF_TRAFFIC_REPLAY_FILE, DEFAULT_TRAFFIC_REPLAY_FILE)): str,
+                vol.Optional(CONF_TRAFFIC_REPLAY_SPEED, default=options.get(CONF_TRAFFIC_REPLAY_SPEED, DEFAULT_TRAFFIC_REPLAY_SPEED)): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
@@ -7,6 +7,7 @@ CONF_BASE_URL = "base_url"
 CONF_API_TOKEN = "api_token"
 CONF_CLIENT_ID = "client_id"
 CONF_NAME = "name"
+CONF_SERVER_INFO = "server_info"
 
 CONF_STATS_INTERVAL = "stats_interval"
 CONF_SIGNALS_INTERVAL = "signals_interval"
@@ -19,6 +20,14 @@ CONF_ENABLE_SIGNALS = "enable_signals"
 CONF_ENABLE_HEATMAP = "enable_heatmap"
 CONF_ENABLE_RULES = "enable_rules"
 CONF_ENABLE_FIREWALL_RULES = "enable_firewall_rules"
+CONF_FIREWALL_CONFIG_IDS = "firewall_config_ids"
+CONF_HISTORY_MAX_EVENTS = "history_max_events"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_TRAFFIC_RECORD_FILE = "traffic_record_file"
+CONF_TRAFFIC_REPLAY_FILE = "traffic_replay_file"
+CONF_TRAFFIC_REPLAY_SPEED = "traffic_replay_speed"
+CONF_HISTORY_MAX_AGE = "history_max_age"
 
 DEFAULT_NAME = "Mimosa"
 DEFAULT_STATS_INTERVAL = 60
@@ -32,3 +41,39 @@ DEFAULT_ENABLE_SIGNALS = True
 DEFAULT_ENABLE_HEATMAP = False
 DEFAULT_ENABLE_RULES = False
 DEFAULT_ENABLE_FIREWALL_RULES = True
+DEFAULT_FIREWALL_CONFIG_IDS = ""
+DEFAULT_FIREWALL_CONFIG = "default"
+DEFAULT_HISTORY_MAX_EVENTS = 10000
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 10
+DEFAULT_TRAFFIC_RECORD_FILE = ""
+DEFAULT_TRAFFIC_REPLAY_FILE = ""
+DEFAULT_TRAFFIC_REPLAY_SPEED = 1.0
+DEFAULT_HISTORY_MAX_AGE = 86400
+
+FEATURE_SIGNALS = "signals"
+FEATURE_HEATMAP = "heatmap"
+FEATURE_FIREWALL_RULES = "firewall_rules"
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+BREAKER_STATES = [BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN]
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PAYLOAD = "payload"
+ATTR_KIND = "kind"
+ATTR_IP = "ip"
+ATTR_COUNTRY = "country"
+ATTR_RULE = "rule"
+ATTR_WINDOW = "window"
+ATTR_GROUP_BY = "group_by"
+ATTR_LIMIT = "limit"
+ATTR_DURATION = "duration"
+ATTR_PSTATS = "pstats"
+
+SERVICE_GET_PAYLOAD = "get_payload"
+SERVICE_QUERY_OFFENSES = "query_offenses"
+SERVICE_PROFILE = "profile"
+
+PAYLOAD_TYPES = ("stats", "signals", "heatmap", "firewall_rules")
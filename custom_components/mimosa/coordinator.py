@@ -1,11 +1,13 @@
 """Coordinators for Mimosa integration."""
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional, TypeVar
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import (
@@ -15,11 +17,33 @@ from .api import (
     MimosaFeatureDisabled,
     MimosaServiceUnavailable,
 )
+from .const import DEFAULT_FIREWALL_CONFIG
+from .history import MimosaEventStore
+from .models import MimosaFirewallRule, MimosaHeatmap, MimosaSignals, MimosaStats
+from .profiler import PROFILER, profiled
+from .statistics import MimosaStatisticsImporter
 
 _LOGGER = logging.getLogger(__name__)
 
+FIREWALL_FETCH_CONCURRENCY = 4
 
-class MimosaStatsCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
+_DataT = TypeVar("_DataT")
+
+
+class MimosaCoordinator(DataUpdateCoordinator[_DataT]):
+    """Base coordinator timing listener dispatch while profiling."""
+
+    @callback
+    def async_update_listeners(self) -> None:
+        if not PROFILER.active:
+            super().async_update_listeners()
+            return
+        started = time.perf_counter()
+        super().async_update_listeners()
+        PROFILER.add(f"{self.name}.listeners", time.perf_counter() - started)
+
+
+class MimosaStatsCoordinator(MimosaCoordinator[MimosaStats]):
     """Coordinator for Mimosa stats."""
 
     def __init__(self, hass: HomeAssistant, api: MimosaApi, interval: int) -> None:
@@ -30,20 +54,34 @@ class MimosaStatsCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             update_interval=timedelta(seconds=interval),
         )
         self.api = api
+        self.statistics: Optional[MimosaStatisticsImporter] = None
 
-    async def _async_update_data(self) -> Dict[str, Any]:
+    @profiled("mimosa_stats.update")
+    async def _async_update_data(self) -> MimosaStats:
         try:
-            return await self.api.fetch_stats()
+            data = await self.api.fetch_stats()
         except MimosaAuthError as err:
             raise UpdateFailed(f"Auth error: {err}") from err
         except (MimosaFeatureDisabled, MimosaServiceUnavailable, MimosaApiError) as err:
             raise UpdateFailed(f"Stats error: {err}") from err
+        if self.statistics:
+            self.statistics.async_add_snapshot(data)
+        return MimosaStats.from_payload(data)
 
 
-class MimosaSignalsCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
+class MimosaSignalsCoordinator(MimosaCoordinator[MimosaSignals]):
     """Coordinator for Mimosa signals."""
 
-    def __init__(self, hass: HomeAssistant, api: MimosaApi, interval: int, client_id: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: MimosaApi,
+        interval: int,
+        client_id: str,
+        *,
+        history_max_events: int,
+        history_max_age: int,
+    ) -> None:
         super().__init__(
             hass,
             logger=_LOGGER,
@@ -52,17 +90,21 @@ class MimosaSignalsCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         )
         self.api = api
         self.client_id = client_id
+        self.history = MimosaEventStore(history_max_events, history_max_age)
 
-    async def _async_update_data(self) -> Dict[str, Any]:
+    @profiled("mimosa_signals.update")
+    async def _async_update_data(self) -> MimosaSignals:
         try:
-            return await self.api.fetch_signals(self.client_id)
+            data = await self.api.fetch_signals(self.client_id)
         except MimosaAuthError as err:
             raise UpdateFailed(f"Auth error: {err}") from err
         except (MimosaFeatureDisabled, MimosaServiceUnavailable, MimosaApiError) as err:
             raise UpdateFailed(f"Signals error: {err}") from err
+        self.history.ingest_signals(data)
+        return MimosaSignals.from_payload(data)
 
 
-class MimosaHeatmapCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
+class MimosaHeatmapCoordinator(MimosaCoordinator[MimosaHeatmap]):
     """Coordinator for Mimosa heatmap."""
 
     def __init__(
@@ -86,18 +128,20 @@ class MimosaHeatmapCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         self.limit = limit
         self.source = source
 
-    async def _async_update_data(self) -> Dict[str, Any]:
+    @profiled("mimosa_heatmap.update")
+    async def _async_update_data(self) -> MimosaHeatmap:
         try:
-            return await self.api.fetch_heatmap(
+            data = await self.api.fetch_heatmap(
                 window=self.window, limit=self.limit, source=self.source
             )
         except MimosaAuthError as err:
             raise UpdateFailed(f"Auth error: {err}") from err
         except (MimosaFeatureDisabled, MimosaServiceUnavailable, MimosaApiError) as err:
             raise UpdateFailed(f"Heatmap error: {err}") from err
+        return MimosaHeatmap.from_payload(data)
 
 
-class MimosaRulesCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
+class MimosaRulesCoordinator(MimosaCoordinator[Dict[str, Any]]):
     """Coordinator for Mimosa rules."""
 
     def __init__(self, hass: HomeAssistant, api: MimosaApi, interval: int) -> None:
@@ -109,6 +153,7 @@ class MimosaRulesCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
         )
         self.api = api
 
+    @profiled("mimosa_rules.update")
     async def _async_update_data(self) -> Dict[str, Any]:
         try:
             return await self.api.fetch_rules()
@@ -118,15 +163,34 @@ class MimosaRulesCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             raise UpdateFailed(f"Rules error: {err}") from err
 
 
-class MimosaFirewallRulesCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
-    """Coordinator for Mimosa firewall rules."""
+def resolve_firewall_rule_uuid(rule: Dict[str, Any]) -> Optional[str]:
+    return (
+        rule.get("uuid")
+        or rule.get("rule_uuid")
+        or rule.get("id")
+        or rule.get("rule_id")
+    )
+
+
+def firewall_config_key(config_id: Optional[str]) -> str:
+    return config_id or DEFAULT_FIREWALL_CONFIG
+
+
+class MimosaFirewallRulesCoordinator(
+    MimosaCoordinator[Dict[str, Dict[str, MimosaFirewallRule]]]
+):
+    """Coordinator for Mimosa firewall rules.
+
+    Rules of every configured firewall are fetched concurrently in a single
+    refresh and indexed by rule uuid, keyed by config id.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         api: MimosaApi,
         interval: int,
-        config_id: Optional[str],
+        config_ids: List[Optional[str]],
     ) -> None:
         super().__init__(
             hass,
@@ -135,12 +199,43 @@ class MimosaFirewallRulesCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
             update_interval=timedelta(seconds=interval),
         )
         self.api = api
-        self.config_id = config_id
-
-    async def _async_update_data(self) -> Dict[str, Any]:
-        try:
-            return await self.api.fetch_firewall_rules(self.config_id)
-        except MimosaAuthError as err:
-            raise UpdateFailed(f"Auth error: {err}") from err
-        except (MimosaFeatureDisabled, MimosaServiceUnavailable, MimosaApiError) as err:
-            raise UpdateFailed(f"Firewall rules error: {err}") from err
+        self.config_ids = config_ids or [None]
+        self._semaphore = asyncio.Semaphore(FIREWALL_FETCH_CONCURRENCY)
+
+    async def _fetch(self, config_id: Optional[str]) -> Dict[str, Any]:
+        async with self._semaphore:
+            return await self.api.fetch_firewall_rules(config_id)
+
+    @profiled("mimosa_firewall_rules.update")
+    async def _async_update_data(self) -> Dict[str, Dict[str, MimosaFirewallRule]]:
+        results = await asyncio.gather(
+            *(self._fetch(config_id) for config_id in self.config_ids),
+            return_exceptions=True,
+        )
+        data: Dict[str, Dict[str, MimosaFirewallRule]] = {}
+        errors: List[str] = []
+        for config_id, result in zip(self.config_ids, results):
+            key = firewall_config_key(config_id)
+            if isinstance(result, MimosaAuthError):
+                raise UpdateFailed(f"Auth error: {result}") from result
+            if isinstance(result, MimosaApiError):
+                errors.append(f"{key}: {result}")
+                # Keep the last known rules of a firewall that failed this cycle.
+                if self.data and key in self.data:
+                    data[key] = self.data[key]
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            rules: Dict[str, MimosaFirewallRule] = {}
+            for rule in result.get("rules", []):
+                rule_uuid = resolve_firewall_rule_uuid(rule)
+                if rule_uuid:
+                    rules[rule_uuid] = MimosaFirewallRule.from_payload(
+                        rule_uuid, rule
+                    )
+            data[key] = rules
+        if errors:
+            if not data:
+                raise UpdateFailed(f"Firewall rules error: {'; '.join(errors)}")
+            _LOGGER.warning("Firewall rules error: %s", "; ".join(errors))
+        return data
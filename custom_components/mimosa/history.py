@@ -0,0 +1,194 @@
+"""Local store of recent Mimosa offense and block events."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import Counter, deque
+from dataclasses import dataclass
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from homeassistant.util import dt as dt_util
+
+INDEX_FIELDS = ("ip", "country", "rule")
+
+
+@dataclass(slots=True)
+class MimosaEvent:
+    """Compact offense or block event."""
+
+    kind: str
+    key: str
+    timestamp: float
+    ip: Optional[str]
+    country: Optional[str]
+    rule: Optional[str]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "timestamp": dt_util.utc_from_timestamp(self.timestamp).isoformat(),
+            "ip": self.ip,
+            "country": self.country,
+            "rule": self.rule,
+        }
+
+
+def _parse_event(kind: str, item: Dict[str, Any], fallback_id: Any) -> MimosaEvent:
+    timestamp = time.time()
+    raw_time = item.get("created_at") or item.get("timestamp")
+    if raw_time:
+        parsed = dt_util.parse_datetime(str(raw_time))
+        if parsed is not None:
+            timestamp = dt_util.as_utc(parsed).timestamp()
+    event_id = item.get("id", fallback_id)
+    ip = item.get("ip") or item.get("source_ip")
+    if event_id is None:
+        event_id = f"{raw_time}-{ip}"
+    return MimosaEvent(
+        kind=kind,
+        key=f"{kind}:{event_id}",
+        timestamp=timestamp,
+        ip=ip,
+        country=item.get("country") or item.get("country_code"),
+        rule=item.get("rule") or item.get("reason") or item.get("description"),
+    )
+
+
+def _insert_ordered(events: Deque[MimosaEvent], event: MimosaEvent) -> None:
+    """Insert an event after every event with the same or an older timestamp."""
+    if not events or events[-1].timestamp <= event.timestamp:
+        events.append(event)
+        return
+    events.insert(
+        bisect_right(events, event.timestamp, key=lambda item: item.timestamp),
+        event,
+    )
+
+
+class MimosaEventStore:
+    """Bounded event store indexed by source IP, country and rule.
+
+    Events are kept in timestamp order, so every per-key index deque is itself
+    ordered and eviction pops the oldest events from the left of both in O(1).
+    Events mostly arrive in order and are appended; late ones are inserted.
+    """
+
+    def __init__(self, max_events: int, max_age: int) -> None:
+        self.max_events = max_events
+        self.max_age = max_age
+        self._events: Deque[MimosaEvent] = deque()
+        self._keys: set[str] = set()
+        self._indexes: Dict[str, Dict[str, Deque[MimosaEvent]]] = {
+            field: {} for field in INDEX_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def ingest_signals(self, data: Dict[str, Any]) -> int:
+        """Add the events carried by a signals payload, returning the new count."""
+        added = 0
+        for kind in ("offense", "block"):
+            signal = data.get(kind) or {}
+            items = signal.get("events")
+            # last_id only identifies the single "last" item; events without
+            # an id fall back to their time and ip.
+            fallback_id = None
+            if items is None:
+                last = signal.get("last")
+                items = [last] if isinstance(last, dict) else []
+                fallback_id = signal.get("last_id")
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                if self.add(_parse_event(kind, item, fallback_id)):
+                    added += 1
+        self.evict()
+        return added
+
+    def add(self, event: MimosaEvent) -> bool:
+        if event.key in self._keys or event.timestamp < time.time() - self.max_age:
+            return False
+        self._keys.add(event.key)
+        _insert_ordered(self._events, event)
+        for field in INDEX_FIELDS:
+            value = getattr(event, field)
+            if value is not None:
+                _insert_ordered(self._indexes[field].setdefault(value, deque()), event)
+        return True
+
+    def evict(self, now: Optional[float] = None) -> None:
+        cutoff = (now if now is not None else time.time()) - self.max_age
+        events = self._events
+        while events and (
+            len(events) > self.max_events or events[0].timestamp < cutoff
+        ):
+            event = events.popleft()
+            self._keys.discard(event.key)
+            for field in INDEX_FIELDS:
+                value = getattr(event, field)
+                if value is None:
+                    continue
+                index = self._indexes[field]
+                bucket = index.get(value)
+                if bucket and bucket[0] is event:
+                    bucket.popleft()
+                    if not bucket:
+                        del index[value]
+
+    def query(
+        self,
+        *,
+        kind: Optional[str] = None,
+        since: Optional[float] = None,
+        group_by: Optional[str] = None,
+        limit: int = 10,
+        **filters: Optional[str],
+    ) -> Dict[str, Any]:
+        """Filter events and optionally rank the top values of a field."""
+        self.evict()
+        active = {
+            field: value
+            for field, value in filters.items()
+            if field in INDEX_FIELDS and value is not None
+        }
+
+        if group_by and not active and kind is None and since is None:
+            index = self._indexes[group_by]
+            top = sorted(index.items(), key=lambda item: len(item[1]), reverse=True)
+            return {
+                "count": len(self._events),
+                "top": [
+                    {"value": value, "count": len(bucket)}
+                    for value, bucket in top[:limit]
+                ],
+            }
+
+        candidates: Iterable[MimosaEvent] = self._events
+        if active:
+            buckets = [
+                self._indexes[field].get(value, ()) for field, value in active.items()
+            ]
+            candidates = min(buckets, key=len)
+        matched: List[MimosaEvent] = [
+            event
+            for event in candidates
+            if (kind is None or event.kind == kind)
+            and (since is None or event.timestamp >= since)
+            and all(getattr(event, field) == value for field, value in active.items())
+        ]
+
+        result: Dict[str, Any] = {"count": len(matched)}
+        if group_by:
+            counts = Counter(
+                getattr(event, group_by)
+                for event in matched
+                if getattr(event, group_by) is not None
+            )
+            result["top"] = [
+                {"value": value, "count": count}
+                for value, count in counts.most_common(limit)
+            ]
+        else:
+            result["events"] = [event.as_dict() for event in reversed(matched[-limit:])]
+        return result
@@ -0,0 +1,504 @@
+"""Compact models of Mimosa coordinator payloads.
+
+Payloads are parsed once per refresh into these models and shared by every
+entity, so the decoded JSON can be dropped right after the update. Fields the
+entities do not use are kept untouched and the original key order is
+remembered, so ``as_dict`` returns the payload as the server sent it.
+"""
+from __future__ import annotations
+
+from array import array
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+NAN = float("nan")
+
+# Largest magnitude up to which every int is stored exactly in a float.
+_MAX_EXACT_INT = 2**53
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _split(
+    payload: Dict[str, Any], fields: Tuple[str, ...]
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Split a payload into the non-null values of ``fields`` and the rest."""
+    known: Dict[str, Any] = {}
+    extra: Dict[str, Any] = {}
+    for key, value in payload.items():
+        if key in fields and value is not None:
+            known[key] = value
+        else:
+            extra[key] = value
+    return known, extra or None
+
+
+def _merge(
+    extra: Optional[Dict[str, Any]], obj: Any, fields: Tuple[str, ...]
+) -> Dict[str, Any]:
+    result = dict(extra) if extra else {}
+    for field in fields:
+        value = getattr(obj, field)
+        if value is not None:
+            result[field] = value
+    return result
+
+
+def _ordered(result: Dict[str, Any], order: Tuple[str, ...]) -> Dict[str, Any]:
+    """Return ``result`` with its keys in the original payload order."""
+    return {key: result[key] for key in order}
+
+
+class MimosaStats:
+    """Stats counters keyed by dotted path (e.g. ``offenses.total``)."""
+
+    __slots__ = ("_values", "extra", "_order")
+
+    def __init__(
+        self,
+        values: Dict[str, Any],
+        extra: Optional[Dict[str, Any]],
+        order: Tuple[str, ...] = (),
+    ) -> None:
+        self._values = values
+        self.extra = extra
+        self._order = order
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> MimosaStats:
+        values: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+        for group, counters in payload.items():
+            if not isinstance(counters, dict) or not counters:
+                extra[group] = counters
+                continue
+            for name, value in counters.items():
+                values[f"{group}.{name}"] = value
+        return cls(values, extra or None, tuple(payload))
+
+    def get(self, key: str) -> Optional[int]:
+        return _to_int(self._values.get(key))
+
+    def as_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = dict(self.extra) if self.extra else {}
+        for key, value in self._values.items():
+            group, name = key.split(".", 1)
+            result.setdefault(group, {})[name] = value
+        return _ordered(result, self._order)
+
+
+class MimosaSignal:
+    """Latest state of one signal type."""
+
+    _FIELDS = ("new", "new_count", "last_id", "last")
+    __slots__ = _FIELDS + ("extra", "_order")
+
+    def __init__(
+        self,
+        new: Any = None,
+        new_count: Any = None,
+        last_id: Any = None,
+        last: Any = None,
+        extra: Optional[Dict[str, Any]] = None,
+        order: Tuple[str, ...] = (),
+    ) -> None:
+        self.new = new
+        self.new_count = new_count
+        self.last_id = last_id
+        self.last = last
+        self.extra = extra
+        self._order = order
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> MimosaSignal:
+        known, extra = _split(payload, cls._FIELDS)
+        return cls(**known, extra=extra, order=tuple(payload))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return _ordered(_merge(self.extra, self, self._FIELDS), self._order)
+
+
+class MimosaSignals:
+    """Offense and block signals of one poll."""
+
+    __slots__ = ("offense", "block", "timestamp", "extra", "_order")
+
+    def __init__(
+        self,
+        offense: Optional[MimosaSignal],
+        block: Optional[MimosaSignal],
+        timestamp: Any,
+        extra: Optional[Dict[str, Any]],
+        order: Tuple[str, ...] = (),
+    ) -> None:
+        self.offense = offense
+        self.block = block
+        self.timestamp = timestamp
+        self.extra = extra
+        self._order = order
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> MimosaSignals:
+        known, extra = _split(payload, ("offense", "block", "timestamp"))
+        signals: Dict[str, Optional[MimosaSignal]] = {}
+        for kind in ("offense", "block"):
+            raw = known.get(kind)
+            if isinstance(raw, dict):
+                signals[kind] = MimosaSignal.from_payload(raw)
+            else:
+                signals[kind] = None
+                if kind in known:
+                    extra = {**(extra or {}), kind: raw}
+        return cls(
+            signals["offense"],
+            signals["block"],
+            known.get("timestamp"),
+            extra,
+            tuple(payload),
+        )
+
+    def signal(self, kind: str) -> Optional[MimosaSignal]:
+        return getattr(self, kind, None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = dict(self.extra) if self.extra else {}
+        for kind in ("offense", "block"):
+            signal = getattr(self, kind)
+            if signal is not None:
+                result[kind] = signal.as_dict()
+        if self.timestamp is not None:
+            result["timestamp"] = self.timestamp
+        return _ordered(result, self._order)
+
+
+# Key layouts shared by firewall rules of the same shape. Servers send very
+# few shapes; the cap only bounds the cache for pathological payloads.
+_RULE_LAYOUTS: Dict[Tuple[Tuple[str, bool], ...], Tuple[Tuple[str, bool], ...]] = {}
+_MAX_RULE_LAYOUTS = 64
+
+
+def _shared_layout(layout: Tuple[Tuple[str, bool], ...]) -> Tuple[Tuple[str, bool], ...]:
+    shared = _RULE_LAYOUTS.get(layout)
+    if shared is not None:
+        return shared
+    if len(_RULE_LAYOUTS) < _MAX_RULE_LAYOUTS:
+        _RULE_LAYOUTS[layout] = layout
+    return layout
+
+
+class MimosaFirewallRule:
+    """Firewall rule with the fields used by entities in slots.
+
+    Other fields are kept as a tuple of values next to a key layout shared by
+    every rule of the same shape, and the few distinct ``type``, ``action``,
+    ``interface`` and ``config_id`` strings are interned, so a large rule list
+    takes less memory than its decoded JSON.
+    """
+
+    ATTRIBUTES = ("type", "name", "description", "action", "interface", "config_id")
+    _INTERNED = frozenset(("type", "action", "interface", "config_id"))
+    __slots__ = ("uuid", "enabled", "_layout", "_extra") + ATTRIBUTES
+
+    def __init__(
+        self,
+        uuid: str,
+        enabled: Optional[bool] = None,
+        layout: Tuple[Tuple[str, bool], ...] = (),
+        extra: Tuple[Any, ...] = (),
+        type: Any = None,
+        name: Any = None,
+        description: Any = None,
+        action: Any = None,
+        interface: Any = None,
+        config_id: Any = None,
+    ) -> None:
+        self.uuid = uuid
+        # Derived from "enabled"/"is_enabled", which stay in the extra values.
+        self.enabled = enabled
+        # (key, in slot) for every payload key in order; values of the keys
+        # not in a slot are in ``_extra``, in the same order.
+        self._layout = layout
+        self._extra = extra
+        self.type = type
+        self.name = name
+        self.description = description
+        self.action = action
+        self.interface = interface
+        self.config_id = config_id
+
+    @classmethod
+    def from_payload(cls, uuid: str, payload: Dict[str, Any]) -> MimosaFirewallRule:
+        known: Dict[str, Any] = {}
+        extra: List[Any] = []
+        layout: List[Tuple[str, bool]] = []
+        for key, value in payload.items():
+            in_slot = key in cls.ATTRIBUTES and value is not None
+            if in_slot:
+                if key in cls._INTERNED and isinstance(value, str):
+                    value = sys.intern(value)
+                known[key] = value
+            else:
+                extra.append(value)
+            layout.append((key, in_slot))
+        enabled: Optional[bool] = None
+        if "enabled" in payload:
+            enabled = bool(payload["enabled"])
+        elif "is_enabled" in payload:
+            enabled = bool(payload["is_enabled"])
+        return cls(
+            uuid,
+            enabled=enabled,
+            layout=_shared_layout(tuple(layout)),
+            extra=tuple(extra),
+            **known,
+        )
+
+    def attributes(self) -> Dict[str, Any]:
+        """Return the stable subset of the rule exposed as state attributes."""
+        return _merge(None, self, self.ATTRIBUTES)
+
+    def as_dict(self) -> Dict[str, Any]:
+        extra = iter(self._extra)
+        return {
+            key: getattr(self, key) if in_slot else next(extra)
+            for key, in_slot in self._layout
+        }
+
+
+class _RawPoint:
+    """Point kept verbatim because its shape differs from the first point."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+def _dict_point_keys(point: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (
+        "lat" if "lat" in point else "latitude",
+        next((key for key in ("lon", "lng", "longitude") if key in point), "lon"),
+        next((key for key in ("count", "weight", "value") if key in point), "count"),
+    )
+
+
+def _loose_values(point: Any) -> List[float]:
+    """Best-effort coordinates and weight of a point with an unexpected shape."""
+    items: List[Any] = []
+    if isinstance(point, dict):
+        items = [point.get(key) for key in _dict_point_keys(point)]
+    elif isinstance(point, list):
+        items = point[:3]
+    values = [NAN, NAN, NAN]
+    for index, item in enumerate(items):
+        parsed = _to_float(item)
+        if parsed is not None:
+            values[index] = parsed
+    return values
+
+
+class _PointShape:
+    """Layout of heatmap points, taken from the first point.
+
+    ``keys`` is the key order of dict points and None for list points of
+    ``size`` items. ``columns`` holds the position of lat, lon and weight in a
+    point (None when absent) and ``types`` whether each was an int or a float;
+    ``rest`` holds the positions of the other items.
+    """
+
+    __slots__ = ("keys", "size", "columns", "types", "rest")
+
+    def __init__(
+        self,
+        keys: Optional[Tuple[str, ...]],
+        size: int,
+        columns: Tuple[Optional[int], ...],
+        types: Tuple[Optional[type], ...],
+    ) -> None:
+        self.keys = keys
+        self.size = size
+        self.columns = columns
+        self.types = types
+        self.rest = tuple(
+            position for position in range(size) if position not in columns
+        )
+
+    @classmethod
+    def from_point(cls, point: Any) -> _PointShape:
+        keys: Optional[Tuple[str, ...]] = None
+        if isinstance(point, dict):
+            keys = tuple(point)
+            names = _dict_point_keys(point)
+            positions = [keys.index(name) if name in point else None for name in names]
+        elif isinstance(point, list):
+            positions = [index if index < len(point) else None for index in range(3)]
+        else:
+            # Matches no point, so every point is kept verbatim.
+            return cls(None, -1, (None, None, None), (None, None, None))
+        items = list(point.values()) if keys is not None else point
+        columns: List[Optional[int]] = []
+        types: List[Optional[type]] = []
+        for position in positions:
+            kind = type(items[position]) if position is not None else None
+            if kind in (int, float):
+                columns.append(position)
+                types.append(kind)
+            else:
+                columns.append(None)
+                types.append(None)
+        return cls(keys, len(items), tuple(columns), tuple(types))
+
+    def split(self, point: Any) -> Optional[Tuple[List[float], Optional[Tuple[Any, ...]]]]:
+        """Return the numeric values and other items of a point of this shape."""
+        if self.keys is not None:
+            if not isinstance(point, dict) or tuple(point) != self.keys:
+                return None
+            items = tuple(point.values())
+        else:
+            if not isinstance(point, list) or len(point) != self.size:
+                return None
+            items = point
+        values = [NAN, NAN, NAN]
+        for index, (position, kind) in enumerate(zip(self.columns, self.types)):
+            if position is None:
+                continue
+            value = items[position]
+            if type(value) is not kind or (kind is int and abs(value) > _MAX_EXACT_INT):
+                return None
+            values[index] = value
+        rest = tuple(items[position] for position in self.rest)
+        return values, rest or None
+
+    def join(self, values: Tuple[float, ...], rest: Optional[Tuple[Any, ...]]) -> Any:
+        items: List[Any] = [None] * self.size
+        for position, kind, value in zip(self.columns, self.types, values):
+            if position is not None:
+                items[position] = kind(value)
+        if rest:
+            for position, item in zip(self.rest, rest):
+                items[position] = item
+        if self.keys is None:
+            return items
+        return dict(zip(self.keys, items))
+
+
+class MimosaHeatmap:
+    """Heatmap metadata with coordinates stored in flat arrays.
+
+    Points shaped like the first one are stored as their int or float lat,
+    lon and weight plus a tuple of their other items, and rebuilt with the
+    same keys, order and number types. Other points are kept verbatim; their
+    array entries are best-effort values with NaN for anything missing.
+    """
+
+    _FIELDS = ("window", "total_profiles", "points_count")
+    __slots__ = _FIELDS + (
+        "lats",
+        "lons",
+        "weights",
+        "extra",
+        "_order",
+        "_shape",
+        "_point_extras",
+    )
+
+    def __init__(
+        self,
+        lats: array,
+        lons: array,
+        weights: array,
+        shape: Optional[_PointShape],
+        point_extras: Optional[List[Any]],
+        extra: Optional[Dict[str, Any]],
+        order: Tuple[str, ...] = (),
+        window: Any = None,
+        total_profiles: Any = None,
+        points_count: Any = None,
+    ) -> None:
+        self.window = window
+        self.total_profiles = total_profiles
+        self.points_count = points_count
+        self.lats = lats
+        self.lons = lons
+        self.weights = weights
+        self.extra = extra
+        self._order = order
+        # None when the payload had no list of points.
+        self._shape = shape
+        # Per-point other items (a tuple) or _RawPoint, None if no point has any.
+        self._point_extras = point_extras
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> MimosaHeatmap:
+        fields = cls._FIELDS + ("points",)
+        if not isinstance(payload.get("points"), list):
+            fields = cls._FIELDS
+        known, extra = _split(payload, fields)
+        raw_points: List[Any] = known.pop("points", None) or []
+        lats = array("d")
+        lons = array("d")
+        weights = array("d")
+        shape: Optional[_PointShape] = None
+        if "points" in fields:
+            shape = _PointShape.from_point(raw_points[0] if raw_points else None)
+        extras: List[Any] = []
+        has_extras = False
+        for point in raw_points:
+            parts = shape.split(point)
+            if parts is None:
+                values = _loose_values(point)
+                leftover: Any = _RawPoint(point)
+            else:
+                values, leftover = parts
+            lats.append(values[0])
+            lons.append(values[1])
+            weights.append(values[2])
+            extras.append(leftover)
+            has_extras = has_extras or leftover is not None
+        return cls(
+            lats,
+            lons,
+            weights,
+            shape,
+            extras if has_extras else None,
+            extra,
+            tuple(payload),
+            **known,
+        )
+
+    def iter_points(self) -> Iterator[Tuple[float, float, float]]:
+        return zip(self.lats, self.lons, self.weights)
+
+    def points(self) -> List[Any]:
+        shape = self._shape
+        if shape is None:
+            return []
+        extras = self._point_extras
+        result: List[Any] = []
+        for index, values in enumerate(self.iter_points()):
+            leftover = extras[index] if extras is not None else None
+            if isinstance(leftover, _RawPoint):
+                result.append(leftover.value)
+            else:
+                result.append(shape.join(values, leftover))
+        return result
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = _merge(self.extra, self, self._FIELDS)
+        if self._shape is not None:
+            result["points"] = self.points()
+        return _ordered(result, self._order)
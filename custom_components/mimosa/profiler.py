@@ -0,0 +1,93 @@
+"""Timing hooks for the Mimosa integration hot paths."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+from collections import defaultdict
+from functools import wraps
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+_FuncT = TypeVar("_FuncT", bound=Callable[..., Any])
+
+
+class MimosaProfiler:
+    """Collect durations of named sections while a profiling run is active.
+
+    Instrumented code only checks ``active`` when no run is in progress, so
+    the hooks cost a single attribute lookup outside of profiling.
+    """
+
+    def __init__(self) -> None:
+        self.active = False
+        self._samples: Dict[str, List[float]] = defaultdict(list)
+        self._profile: Optional[cProfile.Profile] = None
+
+    def start(self, *, pstats: bool = False) -> None:
+        self._samples.clear()
+        if pstats:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self.active = True
+
+    def stop(self) -> Optional[cProfile.Profile]:
+        """Stop the run and return the cProfile profile, if one was taken."""
+        self.active = False
+        profile, self._profile = self._profile, None
+        if profile is not None:
+            profile.disable()
+        return profile
+
+    def add(self, name: str, duration: float) -> None:
+        self._samples[name].append(duration)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        result: Dict[str, Dict[str, Any]] = {}
+        for name, samples in sorted(self._samples.items()):
+            ordered = sorted(samples)
+            count = len(ordered)
+            result[name] = {
+                "count": count,
+                "total_ms": round(sum(ordered) * 1000, 3),
+                "mean_ms": round(sum(ordered) / count * 1000, 3),
+                "p50_ms": round(ordered[count // 2] * 1000, 3),
+                "p99_ms": round(ordered[min(count - 1, count * 99 // 100)] * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+            }
+        return result
+
+
+PROFILER = MimosaProfiler()
+
+
+def profiled(name: str) -> Callable[[_FuncT], _FuncT]:
+    """Time calls of a function or coroutine function under ``name``."""
+
+    def decorator(func: _FuncT) -> _FuncT:
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not PROFILER.active:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    PROFILER.add(name, time.perf_counter() - started)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not PROFILER.active:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.add(name, time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -3,14 +3,22 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_NAME, DOMAIN, DEFAULT_NAME
+from .api import MimosaApi
+from .batcher import MimosaBatchedEntityMixin
+from .const import BREAKER_STATES, CONF_NAME, DOMAIN, DEFAULT_NAME
 from .coordinator import MimosaHeatmapCoordinator, MimosaStatsCoordinator
+from .profiler import profiled
 
 
 STAT_SENSORS: tuple[tuple[str, str, str], ...] = (
@@ -39,10 +47,14 @@ async def async_setup_entry(
     if runtime.heatmap_coordinator:
         entities.append(MimosaHeatmapSensor(runtime.heatmap_coordinator, entry))
 
+    entities.append(MimosaCircuitBreakerSensor(runtime.api, entry))
+
     async_add_entities(entities)
 
 
-class MimosaStatsSensor(CoordinatorEntity[MimosaStatsCoordinator], SensorEntity):
+class MimosaStatsSensor(
+    MimosaBatchedEntityMixin, CoordinatorEntity[MimosaStatsCoordinator], SensorEntity
+):
     """Sensor for Mimosa stats."""
 
     def __init__(
@@ -66,24 +78,14 @@ class MimosaStatsSensor(CoordinatorEntity[MimosaStatsCoordinator], SensorEntity)
         )
 
     @property
+    @profiled("sensor.stats_value")
     def native_value(self) -> Optional[int]:
-        data = self.coordinator.data or {}
-        parts = self._key.split(".")
-        cursor: Any = data
-        for part in parts:
-            if not isinstance(cursor, dict):
-                return None
-            cursor = cursor.get(part)
-        if cursor is None:
-            return None
-        try:
-            return int(cursor)
-        except (TypeError, ValueError):
-            return None
+        data = self.coordinator.data
+        return data.get(self._key) if data is not None else None
 
 
 class MimosaHeatmapSensor(
-    CoordinatorEntity[MimosaHeatmapCoordinator], SensorEntity
+    MimosaBatchedEntityMixin, CoordinatorEntity[MimosaHeatmapCoordinator], SensorEntity
 ):
     """Sensor for Mimosa heatmap metadata."""
 
@@ -101,20 +103,59 @@ class MimosaHeatmapSensor(
 
     @property
     def native_value(self) -> Optional[int]:
-        data = self.coordinator.data or {}
-        count = data.get("points_count")
+        data = self.coordinator.data
+        if data is None:
+            return None
         try:
-            return int(count)
+            return int(data.points_count)
         except (TypeError, ValueError):
             return None
 
     @property
+    @profiled("sensor.heatmap_attributes")
     def extra_state_attributes(self) -> Dict[str, Any]:
-        data = self.coordinator.data or {}
+        # The points themselves are served by the mimosa.get_payload service
+        # rather than copied into the state machine on every write.
+        data = self.coordinator.data
+        if data is None:
+            return {"source": getattr(self.coordinator, "source", None)}
         return {
-            "window": data.get("window"),
-            "points": data.get("points", []),
-            "total_profiles": data.get("total_profiles"),
-            "points_count": data.get("points_count"),
+            "window": data.window,
+            "total_profiles": data.total_profiles,
+            "points_count": data.points_count,
             "source": getattr(self.coordinator, "source", None),
         }
+
+
+class MimosaCircuitBreakerSensor(SensorEntity):
+    """Diagnostic sensor for the API circuit breaker state."""
+
+    _attr_name = "Mimosa API Circuit"
+    _attr_icon = "mdi:electric-switch"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = BREAKER_STATES
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(self, api: MimosaApi, entry: ConfigEntry) -> None:
+        self._breaker = api.breaker
+        self._attr_unique_id = f"{entry.entry_id}_api_circuit"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.data.get(CONF_NAME, DEFAULT_NAME),
+            manufacturer="Mimosa",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._breaker.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> str:
+        return self._breaker.state
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        return {"consecutive_failures": self._breaker.failures}
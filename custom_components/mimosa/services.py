@@ -0,0 +1,195 @@
+"""Services for Mimosa integration."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+from typing import Any, Dict, Optional
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_COUNTRY,
+    ATTR_DURATION,
+    ATTR_GROUP_BY,
+    ATTR_IP,
+    ATTR_KIND,
+    ATTR_LIMIT,
+    ATTR_PAYLOAD,
+    ATTR_PSTATS,
+    ATTR_RULE,
+    ATTR_WINDOW,
+    DOMAIN,
+    PAYLOAD_TYPES,
+    SERVICE_GET_PAYLOAD,
+    SERVICE_PROFILE,
+    SERVICE_QUERY_OFFENSES,
+)
+from .history import INDEX_FIELDS
+from .profiler import PROFILER
+
+GET_PAYLOAD_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PAYLOAD): vol.In(PAYLOAD_TYPES),
+    }
+)
+
+QUERY_OFFENSES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_KIND): vol.In(("offense", "block")),
+        vol.Optional(ATTR_IP): cv.string,
+        vol.Optional(ATTR_COUNTRY): cv.string,
+        vol.Optional(ATTR_RULE): cv.string,
+        vol.Optional(ATTR_WINDOW): cv.time_period,
+        vol.Optional(ATTR_GROUP_BY): vol.In(INDEX_FIELDS),
+        vol.Optional(ATTR_LIMIT, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=30): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=600)
+        ),
+        vol.Optional(ATTR_PSTATS, default=False): cv.boolean,
+    }
+)
+
+
+def _get_runtime(hass: HomeAssistant, call: ServiceCall) -> Any:
+    runtimes: Dict[str, Any] = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is None:
+        if len(runtimes) != 1:
+            raise ServiceValidationError(
+                f"{ATTR_CONFIG_ENTRY_ID} is required when {len(runtimes)} Mimosa entries are loaded"
+            )
+        return next(iter(runtimes.values()))
+    runtime = runtimes.get(entry_id)
+    if runtime is None:
+        raise ServiceValidationError(f"Mimosa entry {entry_id} is not loaded")
+    return runtime
+
+
+def _as_dict(data: Any) -> Any:
+    """Expand coordinator models (possibly nested in dicts) into plain data."""
+    if data is None:
+        return {}
+    if isinstance(data, dict):
+        return {key: _as_dict(value) for key, value in data.items()}
+    return data.as_dict()
+
+
+async def _async_get_payload(call: ServiceCall) -> ServiceResponse:
+    runtime = _get_runtime(call.hass, call)
+    payload = call.data[ATTR_PAYLOAD]
+    coordinator = getattr(runtime, f"{payload}_coordinator")
+    if coordinator is None:
+        raise ServiceValidationError(f"Mimosa {payload} is not enabled")
+    return {"payload": payload, "data": _as_dict(coordinator.data)}
+
+
+async def _async_query_offenses(call: ServiceCall) -> ServiceResponse:
+    runtime = _get_runtime(call.hass, call)
+    coordinator = runtime.signals_coordinator
+    if coordinator is None:
+        raise ServiceValidationError("Mimosa signals are not enabled")
+    since = None
+    if (window := call.data.get(ATTR_WINDOW)) is not None:
+        since = (dt_util.utcnow() - window).timestamp()
+    return coordinator.history.query(
+        kind=call.data.get(ATTR_KIND),
+        since=since,
+        group_by=call.data.get(ATTR_GROUP_BY),
+        limit=call.data[ATTR_LIMIT],
+        ip=call.data.get(ATTR_IP),
+        country=call.data.get(ATTR_COUNTRY),
+        rule=call.data.get(ATTR_RULE),
+    )
+
+
+def _write_profile_report(
+    path: str,
+    summary: Dict[str, Dict[str, Any]],
+    duration: int,
+    profile: Optional[cProfile.Profile],
+    pstats_path: str,
+) -> None:
+    columns = ("count", "total_ms", "mean_ms", "p50_ms", "p99_ms", "max_ms")
+    width = max((len(name) for name in summary), default=10)
+    lines = [
+        f"Mimosa profile over {duration}s",
+        "",
+        f"{'section':<{width}}  " + "  ".join(f"{col:>10}" for col in columns),
+    ]
+    for name, stats in summary.items():
+        lines.append(
+            f"{name:<{width}}  " + "  ".join(f"{stats[col]:>10}" for col in columns)
+        )
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    if profile is not None:
+        profile.dump_stats(pstats_path)
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    hass = call.hass
+    if PROFILER.active:
+        raise ServiceValidationError("A Mimosa profiling run is already active")
+    duration = call.data[ATTR_DURATION]
+    PROFILER.start(pstats=call.data[ATTR_PSTATS])
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profile = PROFILER.stop()
+    summary = PROFILER.summary()
+
+    stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    report_path = hass.config.path(f"mimosa_profile_{stamp}.txt")
+    pstats_path = hass.config.path(f"mimosa_profile_{stamp}.pstats")
+    await hass.async_add_executor_job(
+        _write_profile_report, report_path, summary, duration, profile, pstats_path
+    )
+    response: Dict[str, Any] = {"report": report_path, "sections": summary}
+    if profile is not None:
+        response["pstats"] = pstats_path
+    return response
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register Mimosa services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PAYLOAD,
+        _async_get_payload,
+        schema=GET_PAYLOAD_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_OFFENSES,
+        _async_query_offenses,
+        schema=QUERY_OFFENSES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
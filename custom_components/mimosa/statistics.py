@@ -0,0 +1,226 @@
+"""Long-term statistics import for Mimosa counters."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Dict, List, Optional
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import MimosaApi, MimosaApiError
+from .const import DOMAIN
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Cores before mean_type replaced has_mean.
+    StatisticMeanType = None
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# Maximum number of missed hours requested from the server after downtime.
+BACKFILL_MAX_HOURS = 24 * 7
+
+# (stats key, statistic name, has_sum). Counters that only grow are imported
+# as sums, the others as hourly mean/min/max.
+STATISTIC_KEYS: tuple[tuple[str, str, bool], ...] = (
+    ("offenses.total", "Offenses Total", True),
+    ("blocks.total", "Blocks Total", True),
+    ("blocks.current", "Blocks Current", False),
+)
+
+# Bucket layout per key: [min, max, total, count, last].
+_MIN, _MAX, _TOTAL, _COUNT, _LAST = range(5)
+
+
+def _resolve_value(data: Dict[str, Any], key: str) -> Optional[float]:
+    cursor: Any = data
+    for part in key.split("."):
+        if not isinstance(cursor, dict):
+            return None
+        cursor = cursor.get(part)
+    try:
+        return float(cursor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}.statistics"
+
+
+async def async_remove_statistics_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the importer state stored for a removed config entry."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
+
+
+def _hour_start(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class MimosaStatisticsImporter:
+    """Buffer stats snapshots per hour and bulk import them as statistics."""
+
+    def __init__(
+        self, hass: HomeAssistant, api: MimosaApi, entry_id: str, name: str
+    ) -> None:
+        self.hass = hass
+        self.api = api
+        self.name = name
+        self._statistic_prefix = f"{DOMAIN}:{entry_id.lower()}"
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+        self._last_imported: Optional[int] = None
+        self._buckets: Dict[int, Dict[str, List[float]]] = {}
+        # Snapshots are only buffered until the backfill has run, so a flush
+        # cannot import stale local buckets or move past hours being fetched.
+        self._backfilled = False
+
+    def statistic_id(self, key: str) -> str:
+        return f"{self._statistic_prefix}_{key.replace('.', '_')}"
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load() or {}
+        self._last_imported = stored.get("last_imported")
+        self._buckets = {
+            int(hour): values for hour, values in stored.get("buckets", {}).items()
+        }
+
+    async def async_backfill(self) -> None:
+        """Fill hours missed while Home Assistant was not polling.
+
+        Must run before snapshots are imported; until it finishes they are
+        only buffered.
+        """
+        current_hour = _hour_start(dt_util.utcnow())
+        earliest = current_hour - timedelta(hours=BACKFILL_MAX_HOURS)
+        start = earliest
+        if self._last_imported is not None:
+            start = max(
+                earliest,
+                dt_util.utc_from_timestamp(self._last_imported) + timedelta(hours=1),
+            )
+        try:
+            if start < current_hour:
+                try:
+                    history = await self.api.fetch_stats_history(start=start)
+                except MimosaApiError as err:
+                    _LOGGER.debug(
+                        "Stats history unavailable, importing buffered snapshots: %s",
+                        err,
+                    )
+                else:
+                    self._merge_history(history, current_hour)
+        finally:
+            self._backfilled = True
+            self.async_flush()
+
+    def _merge_history(self, history: Dict[str, Any], current_hour: datetime) -> None:
+        for bucket in history.get("buckets", []):
+            start = dt_util.parse_datetime(str(bucket.get("start")))
+            if start is None:
+                continue
+            hour = _hour_start(dt_util.as_utc(start))
+            if hour >= current_hour:
+                continue
+            # Server-side buckets are authoritative over partial local ones.
+            self._buckets.pop(int(hour.timestamp()), None)
+            self._add(int(hour.timestamp()), bucket)
+
+    def _add(self, hour: int, data: Dict[str, Any]) -> None:
+        bucket = self._buckets.setdefault(hour, {})
+        for key, _name, _has_sum in STATISTIC_KEYS:
+            value = _resolve_value(data, key)
+            if value is None:
+                continue
+            values = bucket.get(key)
+            if values is None:
+                bucket[key] = [value, value, value, 1, value]
+                continue
+            values[_MIN] = min(values[_MIN], value)
+            values[_MAX] = max(values[_MAX], value)
+            values[_TOTAL] += value
+            values[_COUNT] += 1
+            values[_LAST] = value
+
+    @callback
+    def async_add_snapshot(self, data: Dict[str, Any]) -> None:
+        """Record a polled stats payload and import any completed hours."""
+        now = dt_util.utcnow()
+        self._add(int(_hour_start(now).timestamp()), data)
+        if self._backfilled:
+            self.async_flush(now)
+
+    @callback
+    def async_flush(self, now: Optional[datetime] = None) -> None:
+        """Import every completed hour in one write per statistic."""
+        current_hour = int(_hour_start(now or dt_util.utcnow()).timestamp())
+        completed = sorted(hour for hour in self._buckets if hour < current_hour)
+        if not completed:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+            return
+
+        for key, name, has_sum in STATISTIC_KEYS:
+            statistics: list[StatisticData] = []
+            for hour in completed:
+                if self._last_imported is not None and hour <= self._last_imported:
+                    continue
+                values = self._buckets[hour].get(key)
+                if values is None:
+                    continue
+                start = dt_util.utc_from_timestamp(hour)
+                if has_sum:
+                    statistics.append(
+                        StatisticData(
+                            start=start, state=values[_LAST], sum=values[_LAST]
+                        )
+                    )
+                else:
+                    statistics.append(
+                        StatisticData(
+                            start=start,
+                            mean=values[_TOTAL] / values[_COUNT],
+                            min=values[_MIN],
+                            max=values[_MAX],
+                        )
+                    )
+            if not statistics:
+                continue
+            async_add_external_statistics(
+                self.hass, self._metadata(key, name, has_sum), statistics
+            )
+
+        self._last_imported = max(completed[-1], self._last_imported or 0)
+        for hour in completed:
+            del self._buckets[hour]
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _metadata(self, key: str, name: str, has_sum: bool) -> StatisticMetaData:
+        metadata = StatisticMetaData(
+            has_sum=has_sum,
+            name=f"{self.name} {name}",
+            source=DOMAIN,
+            statistic_id=self.statistic_id(key),
+            unit_of_measurement=None,
+        )
+        if StatisticMeanType is None:
+            metadata["has_mean"] = not has_sum
+        else:
+            metadata["mean_type"] = (
+                StatisticMeanType.NONE if has_sum else StatisticMeanType.ARITHMETIC
+            )
+            metadata["unit_class"] = None
+        return metadata
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "last_imported": self._last_imported,
+            "buckets": {str(hour): values for hour, values in self._buckets.items()},
+        }
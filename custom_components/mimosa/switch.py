@@ -9,8 +9,11 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .batcher import MimosaBatchedEntityMixin
 from .const import CONF_NAME, DEFAULT_NAME, DOMAIN
-from .coordinator import MimosaFirewallRulesCoordinator
+from .coordinator import MimosaFirewallRulesCoordinator, firewall_config_key
+from .models import MimosaFirewallRule
+from .profiler import profiled
 
 
 async def async_setup_entry(
@@ -30,21 +33,24 @@ FIREWALL_RULE_TYPES = {"whitelist", "blacklist", "temporal"}
 def _setup_dynamic_firewall(
     coordinator: MimosaFirewallRulesCoordinator, entry: ConfigEntry, async_add_entities
 ) -> None:
-    known: set[str] = set()
+    known: set[tuple[str, str]] = set()
 
     def _refresh() -> None:
         data = coordinator.data or {}
-        rules = data.get("rules", [])
         new_entities: list[SwitchEntity] = []
-        for rule in rules:
-            rule_uuid = _resolve_firewall_rule_uuid(rule)
-            rule_type = rule.get("type")
-            if rule_type and rule_type not in FIREWALL_RULE_TYPES:
-                continue
-            if not rule_uuid or rule_uuid in known:
-                continue
-            known.add(rule_uuid)
-            new_entities.append(MimosaFirewallRuleSwitch(coordinator, entry, rule_uuid))
+        for config_id in coordinator.config_ids:
+            rules = data.get(firewall_config_key(config_id), {})
+            for rule_uuid, rule in rules.items():
+                rule_type = rule.type
+                if rule_type and rule_type not in FIREWALL_RULE_TYPES:
+                    continue
+                key = (firewall_config_key(config_id), rule_uuid)
+                if key in known:
+                    continue
+                known.add(key)
+                new_entities.append(
+                    MimosaFirewallRuleSwitch(coordinator, entry, rule_uuid, config_id)
+                )
         if new_entities:
             async_add_entities(new_entities)
 
@@ -52,17 +58,10 @@ def _setup_dynamic_firewall(
     coordinator.async_add_listener(_refresh)
 
 
-def _resolve_firewall_rule_uuid(rule: Dict[str, Any]) -> Optional[str]:
-    return (
-        rule.get("uuid")
-        or rule.get("rule_uuid")
-        or rule.get("id")
-        or rule.get("rule_id")
-    )
-
-
 class MimosaFirewallRuleSwitch(
-    CoordinatorEntity[MimosaFirewallRulesCoordinator], SwitchEntity
+    MimosaBatchedEntityMixin,
+    CoordinatorEntity[MimosaFirewallRulesCoordinator],
+    SwitchEntity,
 ):
     """Switch for firewall rules."""
 
@@ -71,10 +70,18 @@ class MimosaFirewallRuleSwitch(
         coordinator: MimosaFirewallRulesCoordinator,
         entry: ConfigEntry,
         rule_uuid: str,
+        config_id: Optional[str],
     ) -> None:
         super().__init__(coordinator)
         self.rule_uuid = rule_uuid
-        self._attr_unique_id = f"{entry.entry_id}_firewall_rule_{rule_uuid}"
+        self.config_id = config_id
+        self._config_key = firewall_config_key(config_id)
+        if config_id:
+            self._attr_unique_id = (
+                f"{entry.entry_id}_firewall_rule_{config_id}_{rule_uuid}"
+            )
+        else:
+            self._attr_unique_id = f"{entry.entry_id}_firewall_rule_{rule_uuid}"
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.entry_id)},
             name=entry.data.get(CONF_NAME, DEFAULT_NAME),
@@ -82,18 +89,15 @@ class MimosaFirewallRuleSwitch(
         )
 
     @property
-    def _rule(self) -> Dict[str, Any]:
+    @profiled("switch.firewall_rule")
+    def _rule(self) -> Optional[MimosaFirewallRule]:
         data = self.coordinator.data or {}
-        rules = data.get("rules", [])
-        for rule in rules:
-            if _resolve_firewall_rule_uuid(rule) == self.rule_uuid:
-                return rule
-        return {}
+        return data.get(self._config_key, {}).get(self.rule_uuid)
 
     @property
     def name(self) -> str | None:
         rule = self._rule
-        rule_type = rule.get("type")
+        rule_type = rule.type if rule else None
         if rule_type == "whitelist":
             label = "Whitelist"
         elif rule_type == "blacklist":
@@ -101,35 +105,39 @@ class MimosaFirewallRuleSwitch(
         elif rule_type == "temporal":
             label = "Temporal Blocklist"
         else:
-            label = rule.get("name") or rule.get("description") or self.rule_uuid
+            label = (rule and (rule.name or rule.description)) or self.rule_uuid
+        if self.config_id:
+            return f"Firewall {self.config_id} {label}"
         return f"Firewall {label}"
 
     @property
     def is_on(self) -> bool | None:
         rule = self._rule
-        if "enabled" in rule:
-            return bool(rule.get("enabled"))
-        if "is_enabled" in rule:
-            return bool(rule.get("is_enabled"))
-        return None
+        return rule.enabled if rule else None
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         rule = self._rule
         if not rule:
             return {}
-        payload = dict(rule)
+        payload = rule.attributes()
         payload["rule_uuid"] = self.rule_uuid
+        if self.config_id:
+            payload["config_id"] = self.config_id
         return payload
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self.coordinator.api.toggle_firewall_rule(
-            self.rule_uuid, True, self.coordinator.config_id
+            self.rule_uuid, True, self.config_id
         )
+        if self._batcher is not None:
+            self._batcher.async_expedite(self)
         await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         await self.coordinator.api.toggle_firewall_rule(
-            self.rule_uuid, False, self.coordinator.config_id
+            self.rule_uuid, False, self.config_id
         )
+        if self._batcher is not None:
+            self._batcher.async_expedite(self)
         await self.coordinator.async_request_refresh()
@@ -0,0 +1,141 @@
+"""Record and replay Mimosa API traffic."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import gzip
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = timedelta(seconds=30)
+
+# One recorded exchange: (offset, status, body, duration), offsets and
+# durations in seconds since the recording started.
+_Exchange = Tuple[float, int, Any, float]
+
+
+def _request_key(method: str, path: str, params: Optional[Dict[str, Any]]) -> str:
+    return f"{method} {path} {json.dumps(params or {}, sort_keys=True, default=str)}"
+
+
+class MimosaTrafficRecorder:
+    """Append request/response pairs with timing to a gzipped JSON lines file."""
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        self.hass = hass
+        self.path = path
+        self._started = time.monotonic()
+        self._buffer: List[str] = []
+        self._unsub = async_track_time_interval(
+            hass, self._async_flush_interval, FLUSH_INTERVAL
+        )
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        status: int,
+        body: Any,
+        duration: float,
+    ) -> None:
+        self._buffer.append(
+            json.dumps(
+                {
+                    "t": round(time.monotonic() - self._started - duration, 3),
+                    "m": method,
+                    "p": path,
+                    "q": params or {},
+                    "s": status,
+                    "d": round(duration, 4),
+                    "b": body,
+                },
+                separators=(",", ":"),
+                default=str,
+            )
+            + "\n"
+        )
+
+    async def _async_flush_interval(self, _now: Any) -> None:
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        await self.hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: List[str]) -> None:
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    async def async_close(self) -> None:
+        self._unsub()
+        await self.async_flush()
+
+
+class MimosaReplayTransport:
+    """Serve recorded responses back in place of the HTTP session.
+
+    The replay clock runs ``speed`` times faster than real time. Each request
+    gets the latest recorded response for the same request that is not in the
+    future, advancing at least one exchange per call, and waits for the
+    recorded duration scaled by ``speed``.
+    """
+
+    def __init__(self, exchanges: Dict[str, List[_Exchange]], speed: float) -> None:
+        if speed <= 0:
+            raise ValueError(f"Replay speed must be positive, got {speed}")
+        self.speed = speed
+        self._exchanges = exchanges
+        self._cursors: Dict[str, int] = {}
+        self._started = time.monotonic()
+
+    @classmethod
+    async def async_load(
+        cls, hass: HomeAssistant, path: str, speed: float
+    ) -> MimosaReplayTransport:
+        exchanges = await hass.async_add_executor_job(cls._read, path)
+        _LOGGER.info(
+            "Replaying %s recorded Mimosa exchanges from %s",
+            sum(len(items) for items in exchanges.values()),
+            path,
+        )
+        return cls(exchanges, speed)
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, List[_Exchange]]:
+        exchanges: Dict[str, List[_Exchange]] = {}
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                item = json.loads(line)
+                exchanges.setdefault(
+                    _request_key(item["m"], item["p"], item["q"]), []
+                ).append((item["t"], item["s"], item["b"], item["d"]))
+        for items in exchanges.values():
+            items.sort(key=lambda exchange: exchange[0])
+        return exchanges
+
+    async def async_response(
+        self, method: str, path: str, params: Optional[Dict[str, Any]]
+    ) -> Tuple[int, Any]:
+        key = _request_key(method, path, params)
+        exchanges = self._exchanges.get(key)
+        if not exchanges:
+            return 404, f"No recorded response for {method} {path}"
+        elapsed = (time.monotonic() - self._started) * self.speed
+        index = min(self._cursors.get(key, -1) + 1, len(exchanges) - 1)
+        while index + 1 < len(exchanges) and exchanges[index + 1][0] <= elapsed:
+            index += 1
+        self._cursors[key] = index
+        _offset, status, body, duration = exchanges[index]
+        if duration:
+            await asyncio.sleep(duration / self.speed)
+        return status, body